@@ -1,452 +1,767 @@
-import json
-import os
-from datetime import datetime
-
-DATA_FILE = "erp_data.json"
-
-# ------------------ Data Handling ------------------
-def load_data():
-    try:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r") as f:
-                data = json.load(f)
-        else:
-            data = {"streams": {}, "student_counter": 1, "faculty_counter": 1}
-    except (IOError, json.JSONDecodeError) as e:
-        print(f"⚠️ Error loading data: {e}")
-        data = {"streams": {}, "student_counter": 1, "faculty_counter": 1}
-
-    # Ensure counters exist (for backward compatibility)
-    if "student_counter" not in data:
-        data["student_counter"] = 1
-    if "faculty_counter" not in data:
-        data["faculty_counter"] = 1
-
-    # Auto-migrate students if stored as list
-    for stream, sdata in data.get("streams", {}).items():
-        for cls, cls_data in sdata.get("classes", {}).items():
-            if isinstance(cls_data.get("students"), list):
-                new_students = {}
-                for i, name in enumerate(cls_data["students"], start=1):
-                    sid = f"STU{data['student_counter']:03d}"
-                    data["student_counter"] += 1
-                    new_students[sid] = {"name": name}
-                cls_data["students"] = new_students
-
-    return data
-
-def save_data(data):
-    try:
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=4)
-    except IOError as e:
-        print(f"⚠️ Error saving data: {e}")
-
-def backup_data(data):
-    backup_file = f"erp_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    try:
-        with open(backup_file, "w") as f:
-            json.dump(data, f, indent=4)
-        print(f"✅ Backup created: {backup_file}")
-        return True
-    except IOError as e:
-        print(f"⚠️ Error creating backup: {e}")
-        return False
-
-
-# ------------------ Utility ------------------
-def get_valid_input(prompt, input_type=str, validation_func=None, allow_empty=False):
-    while True:
-        try:
-            value = input(prompt).strip()
-            if allow_empty and not value:
-                return None
-            if not value and not allow_empty:
-                print("⚠️ This field cannot be empty!")
-                continue
-                
-            if input_type != str:
-                value = input_type(value)
-                
-            if validation_func and not validation_func(value):
-                raise ValueError
-            return value
-        except ValueError:
-            print("⚠️ Invalid input! Please try again.")
-
-def select_option(options, title="Choose an option", allow_back=False):
-    """Helper to display numbered menu from a list/dict keys"""
-    if not options:
-        print("⚠️ Nothing available!")
-        return None
-        
-    print(f"\n--- {title} ---")
-    options_list = list(options)
-    
-    for i, opt in enumerate(options_list, 1):
-        print(f"{i}. {opt}")
-        
-    if allow_back:
-        print(f"{len(options_list) + 1}. Back")
-    
-    try:
-        choice = get_valid_input("Enter choice: ", int)
-        if allow_back and choice == len(options_list) + 1:
-            return None
-            
-        if 1 <= choice <= len(options_list):
-            return options_list[choice - 1]
-        else:
-            print("⚠️ Invalid choice!")
-            return None
-    except ValueError:
-        print("⚠️ Enter a number!")
-        return None
-
-
-# ------------------ ERP Operations ------------------
-def add_stream(data):
-    stream_name = get_valid_input("Enter stream name (e.g. BCA, BSc IT): ", validation_func=lambda x: len(x) > 0)
-    if stream_name not in data["streams"]:
-        data["streams"][stream_name] = {"classes": {}, "faculty": {}}
-        print(f"✅ Stream '{stream_name}' added.")
-    else:
-        print("⚠️ Stream already exists!")
-
-def add_class(data):
-    stream = select_option(data["streams"], "Select Stream", allow_back=True)
-    if not stream:
-        return
-        
-    class_name = get_valid_input("Enter class (e.g. 1A, 2B): ", validation_func=lambda x: len(x) > 0)
-    if class_name not in data["streams"][stream]["classes"]:
-        data["streams"][stream]["classes"][class_name] = {"students": {}}
-        print(f"✅ Class '{class_name}' added in {stream}.")
-    else:
-        print("⚠️ Class already exists!")
-
-def add_student(data):
-    stream = select_option(data["streams"], "Select Stream", allow_back=True)
-    if not stream:
-        return
-        
-    classes = data["streams"][stream]["classes"]
-    if not classes:
-        print("⚠️ No classes available in this stream!")
-        return
-        
-    class_name = select_option(classes, f"Select Class in {stream}", allow_back=True)
-    if not class_name:
-        return
-        
-    student_name = get_valid_input("Enter student name: ", validation_func=lambda x: len(x) > 0)
-    student_id = f"STU{data['student_counter']:03d}"
-    data["student_counter"] += 1
-    classes[class_name]["students"][student_id] = {"name": student_name}
-    print(f"✅ Student '{student_name}' (ID: {student_id}) added to {stream} - {class_name}.")
-
-def add_faculty(data):
-    stream = select_option(data["streams"], "Select Stream", allow_back=True)
-    if not stream:
-        return
-        
-    faculty_name = get_valid_input("Enter faculty name: ", validation_func=lambda x: len(x) > 0)
-    faculty_id = f"FAC{data['faculty_counter']:03d}"
-    data["faculty_counter"] += 1
-    data["streams"][stream]["faculty"][faculty_id] = {
-        "name": faculty_name,
-        "assigned_class": None,
-    }
-    print(f"✅ Faculty '{faculty_name}' (ID: {faculty_id}) added in {stream}.")
-
-def assign_faculty(data):
-    stream = select_option(data["streams"], "Select Stream", allow_back=True)
-    if not stream:
-        return
-        
-    faculty_list = data["streams"][stream]["faculty"]
-    if not faculty_list:
-        print("⚠️ No faculty available in this stream!")
-        return
-        
-    faculty = select_option(faculty_list, "Select Faculty", allow_back=True)
-    if not faculty:
-        return
-        
-    classes = data["streams"][stream]["classes"]
-    if not classes:
-        print("⚠️ No classes available in this stream!")
-        return
-        
-    class_name = select_option(classes, f"Select Class in {stream}", allow_back=True)
-    if not class_name:
-        return
-        
-    data["streams"][stream]["faculty"][faculty]["assigned_class"] = class_name
-    print(
-        f"✅ Faculty '{data['streams'][stream]['faculty'][faculty]['name']}' "
-        f"assigned to {stream} - {class_name}."
-    )
-
-def remove_stream(data):
-    stream = select_option(data["streams"], "Select Stream to Remove", allow_back=True)
-    if not stream:
-        return
-        
-    confirm = get_valid_input(f"Are you sure you want to remove stream '{stream}'? (y/n): ", 
-                             validation_func=lambda x: x.lower() in ['y', 'n'])
-    if confirm.lower() == 'y':
-        del data["streams"][stream]
-        print(f"✅ Stream '{stream}' removed.")
-    else:
-        print("❌ Stream removal cancelled.")
-
-def remove_class(data):
-    stream = select_option(data["streams"], "Select Stream", allow_back=True)
-    if not stream:
-        return
-        
-    classes = data["streams"][stream]["classes"]
-    if not classes:
-        print("⚠️ No classes available in this stream!")
-        return
-        
-    class_name = select_option(classes, f"Select Class to Remove from {stream}", allow_back=True)
-    if not class_name:
-        return
-        
-    # Check if any faculty is assigned to this class
-    faculty_assigned = False
-    for faculty in data["streams"][stream]["faculty"].values():
-        if faculty["assigned_class"] == class_name:
-            faculty_assigned = True
-            break
-            
-    if faculty_assigned:
-        print("⚠️ Cannot remove class - faculty members are assigned to it!")
-        return
-        
-    confirm = get_valid_input(f"Are you sure you want to remove class '{class_name}'? (y/n): ", 
-                             validation_func=lambda x: x.lower() in ['y', 'n'])
-    if confirm.lower() == 'y':
-        del data["streams"][stream]["classes"][class_name]
-        print(f"✅ Class '{class_name}' removed from {stream}.")
-    else:
-        print("❌ Class removal cancelled.")
-
-def remove_student(data):
-    stream = select_option(data["streams"], "Select Stream", allow_back=True)
-    if not stream:
-        return
-        
-    classes = data["streams"][stream]["classes"]
-    if not classes:
-        print("⚠️ No classes available in this stream!")
-        return
-        
-    class_name = select_option(classes, f"Select Class in {stream}", allow_back=True)
-    if not class_name:
-        return
-        
-    students = classes[class_name]["students"]
-    if not students:
-        print("⚠️ No students in this class!")
-        return
-        
-    student_id = select_option(students, "Select Student to Remove", allow_back=True)
-    if not student_id:
-        return
-        
-    confirm = get_valid_input(f"Are you sure you want to remove student '{students[student_id]['name']}'? (y/n): ", 
-                             validation_func=lambda x: x.lower() in ['y', 'n'])
-    if confirm.lower() == 'y':
-        del classes[class_name]["students"][student_id]
-        print(f"✅ Student removed from {stream} - {class_name}.")
-    else:
-        print("❌ Student removal cancelled.")
-
-def remove_faculty(data):
-    stream = select_option(data["streams"], "Select Stream", allow_back=True)
-    if not stream:
-        return
-        
-    faculty_list = data["streams"][stream]["faculty"]
-    if not faculty_list:
-        print("⚠️ No faculty available in this stream!")
-        return
-        
-    faculty_id = select_option(faculty_list, "Select Faculty to Remove", allow_back=True)
-    if not faculty_id:
-        return
-        
-    confirm = get_valid_input(f"Are you sure you want to remove faculty '{faculty_list[faculty_id]['name']}'? (y/n): ", 
-                             validation_func=lambda x: x.lower() in ['y', 'n'])
-    if confirm.lower() == 'y':
-        del data["streams"][stream]["faculty"][faculty_id]
-        print(f"✅ Faculty removed from {stream}.")
-    else:
-        print("❌ Faculty removal cancelled.")
-
-def search_student(data):
-    name = get_valid_input("Enter student name to search: ", allow_empty=True)
-    if not name:
-        return
-        
-    name = name.lower()
-    found = False
-    
-    for stream, details in data["streams"].items():
-        for cls, cls_data in details["classes"].items():
-            for sid, sdata in cls_data["students"].items():
-                if name in sdata["name"].lower():
-                    print(f"Found: {sdata['name']} (ID: {sid}) in {stream} - {cls}")
-                    found = True
-    
-    if not found:
-        print("No students found with that name.")
-
-def search_faculty(data):
-    name = get_valid_input("Enter faculty name to search: ", allow_empty=True)
-    if not name:
-        return
-        
-    name = name.lower()
-    found = False
-    
-    for stream, details in data["streams"].items():
-        for fid, fdata in details["faculty"].items():
-            if name in fdata["name"].lower():
-                print(f"Found: {fdata['name']} (ID: {fid}) in {stream} - Assigned to: {fdata['assigned_class']}")
-                found = True
-    
-    if not found:
-        print("No faculty found with that name.")
-
-def view_data(data):
-    if not data["streams"]:
-        print("No data available. Add streams, classes, students, and faculty first.")
-        return
-        
-    for stream, details in data["streams"].items():
-        print(f"\n📘 Stream: {stream}")
-
-        # Show classes and students
-        print("   Classes & Students:")
-        if details["classes"]:
-            for cls, cls_data in details["classes"].items():
-                print(f"     • {cls}:")
-                students = cls_data["students"]
-                if students:
-                    for sid, sdata in students.items():
-                        print(f"         - {sid}: {sdata['name']}")
-                else:
-                    print("         (No students yet)")
-        else:
-            print("     (No classes yet)")
-
-        # Show faculty
-        print("   Faculty:")
-        if details["faculty"]:
-            for fid, fac_data in details["faculty"].items():
-                print(
-                    f"     • {fid}: {fac_data['name']} "
-                    f"(Assigned Class: {fac_data['assigned_class'] or 'None'})"
-                )
-        else:
-            print("     (No faculty yet)")
-
-def view_faculty_without_assignments(data):
-    found = False
-    for stream, details in data["streams"].items():
-        for fid, fac_data in details["faculty"].items():
-            if not fac_data["assigned_class"]:
-                print(f"{fid}: {fac_data['name']} in {stream} (No assignment)")
-                found = True
-    
-    if not found:
-        print("All faculty members have assignments.")
-
-def view_classes_without_faculty(data):
-    found = False
-    for stream, details in data["streams"].items():
-        for cls in details["classes"]:
-            # Check if any faculty is assigned to this class
-            faculty_assigned = False
-            for faculty in details["faculty"].values():
-                if faculty["assigned_class"] == cls:
-                    faculty_assigned = True
-                    break
-                    
-            if not faculty_assigned:
-                print(f"{stream} - {cls}: No faculty assigned")
-                found = True
-    
-    if not found:
-        print("All classes have faculty assignments.")
-
-
-# ------------------ Menu ------------------
-def main():
-    data = load_data()
-
-    while True:
-        print("\n--- Educational ERP ---")
-        print("1. Add Stream")
-        print("2. Add Class")
-        print("3. Add Student")
-        print("4. Add Faculty")
-        print("5. Assign Faculty to Class")
-        print("6. View All Data")
-        print("7. Remove Stream")
-        print("8. Remove Class")
-        print("9. Remove Student")
-        print("10. Remove Faculty")
-        print("11. Search Student")
-        print("12. Search Faculty")
-        print("13. View Unassigned Faculty")
-        print("14. View Classes Without Faculty")
-        print("15. Create Backup")
-        print("16. Exit")
-
-        choice = get_valid_input("Enter choice: ", int)
-
-        if choice == 1:
-            add_stream(data)
-        elif choice == 2:
-            add_class(data)
-        elif choice == 3:
-            add_student(data)
-        elif choice == 4:
-            add_faculty(data)
-        elif choice == 5:
-            assign_faculty(data)
-        elif choice == 6:
-            view_data(data)
-        elif choice == 7:
-            remove_stream(data)
-        elif choice == 8:
-            remove_class(data)
-        elif choice == 9:
-            remove_student(data)
-        elif choice == 10:
-            remove_faculty(data)
-        elif choice == 11:
-            search_student(data)
-        elif choice == 12:
-            search_faculty(data)
-        elif choice == 13:
-            view_faculty_without_assignments(data)
-        elif choice == 14:
-            view_classes_without_faculty(data)
-        elif choice == 15:
-            backup_data(data)
-        elif choice == 16:
-            save_data(data)
-            print("💾 Data saved. Exiting...")
-            break
-        else:
-            print("⚠️ Invalid choice!")
-
-
-if __name__ == "__main__":
-    main()
+import atexit
+import bisect
+import gzip
+import itertools
+import json
+import os
+import sys
+import zlib
+from datetime import datetime
+
+try:  # optional C-accelerated JSON serializer/parser
+    import orjson
+except ImportError:
+    orjson = None
+
+# The data file is gzipped at rest: level 1 costs almost no CPU and the
+# JSON's repeated keys compress well, cutting bytes read and written.
+# LEGACY_DATA_FILE is the old uncompressed name, still read on load so
+# existing installs migrate on their first save.
+DATA_FILE = "erp_data.json.gz"
+LEGACY_DATA_FILE = "erp_data.json"
+WAL_FILE = "erp_wal.jsonl"
+
+# Autosave policy: every mutation appends one line to the write-ahead
+# log (O(record) bytes), while the full snapshot in erp_data.json is
+# only rewritten every MAX_DIRTY mutations and on exit. load_data
+# replays any log lines newer than the snapshot, so no acknowledged
+# mutation is lost even on a crash.
+MAX_DIRTY = 50
+_dirty_count = 0
+_wal = None
+
+# ------------------ Data Handling ------------------
+def load_data():
+    try:
+        # Read the whole file once and parse from bytes; orjson's parser
+        # is used when installed. (orjson.JSONDecodeError is a subclass
+        # of json.JSONDecodeError, so the handler below covers both.)
+        # Opening directly and catching FileNotFoundError saves the
+        # stat() a separate existence check would cost, and avoids the
+        # race between checking and opening.
+        try:
+            with gzip.open(DATA_FILE, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            try:
+                with open(LEGACY_DATA_FILE, "rb") as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                raw = None
+
+        if raw is not None:
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            data = _intern_tree(data)
+        else:
+            data = {"streams": {}, "student_counter": 1, "faculty_counter": 1}
+    # A truncated or corrupt gzip file surfaces as EOFError or
+    # zlib.error from the read; treat both like a decode error so the
+    # WAL replay below still runs instead of crash-looping at startup.
+    except (IOError, EOFError, zlib.error, json.JSONDecodeError) as e:
+        print(f"⚠️ Error loading data: {e}")
+        data = {"streams": {}, "student_counter": 1, "faculty_counter": 1}
+
+    # Ensure counters exist (for backward compatibility)
+    if "student_counter" not in data:
+        data["student_counter"] = 1
+    if "faculty_counter" not in data:
+        data["faculty_counter"] = 1
+
+    # Auto-migrate students if stored as list. The schema version lets
+    # already-migrated files skip the walk entirely on later loads.
+    data.setdefault("schema_version", 0)
+    if data["schema_version"] < 1:
+        for stream, sdata in data.get("streams", {}).items():
+            for cls, cls_data in sdata.get("classes", {}).items():
+                if isinstance(cls_data.get("students"), list):
+                    start = data["student_counter"]
+                    names = cls_data["students"]
+                    cls_data["students"] = {
+                        f"STU{start + i:03d}": {"name": name} for i, name in enumerate(names)
+                    }
+                    data["student_counter"] = start + len(names)
+        data["schema_version"] = 1
+
+    _replay_wal(data)
+
+    # Ensure every record carries its pre-lowercased name so searches and
+    # index rebuilds never re-lower. Very old data files also stored
+    # faculty without a "name" field (the id doubled as the name).
+    for stream, sdata in data.get("streams", {}).items():
+        for cls_data in sdata.get("classes", {}).values():
+            for student in cls_data["students"].values():
+                student.setdefault("_nl", student["name"].lower())
+        for fid, fdata in sdata.get("faculty", {}).items():
+            fdata.setdefault("name", fid)
+            fdata.setdefault("_nl", fdata["name"].lower())
+
+    # Rebuild the class -> assigned faculty reverse index and the set of
+    # unassigned faculty per stream. Older data files (or ones saved
+    # with sets dumped as lists) are handled by always reconstructing
+    # both from the faculty records.
+    for stream, sdata in data.get("streams", {}).items():
+        index = {}
+        unassigned = set()
+        for fid, fdata in sdata.get("faculty", {}).items():
+            if fdata.get("assigned_class"):
+                index.setdefault(fdata["assigned_class"], set()).add(fid)
+            else:
+                unassigned.add(fid)
+        sdata["class_faculty"] = index
+        sdata["_unassigned"] = unassigned
+
+    build_search_index(data)
+
+    return data
+
+def build_search_index(data):
+    """Build flat, pre-lowercased search indexes over students and faculty.
+
+    Searching then becomes a single linear scan instead of a walk over
+    the nested stream/class dicts. Records carry their lowercased name in
+    "_nl" (set at insert/load), so rebuilds never re-lower anything.
+    The indexes live under underscore keys and are never serialized.
+    """
+    data["_student_index"] = [
+        (sdata["_nl"], sdata["name"], sid, stream, cls)
+        for stream, s in data["streams"].items()
+        for cls, c in s["classes"].items()
+        for sid, sdata in c["students"].items()
+    ]
+    data["_faculty_index"] = [
+        (fdata["_nl"], fdata["name"], fid, stream)
+        for stream, s in data["streams"].items()
+        for fid, fdata in s["faculty"].items()
+    ]
+    _build_blobs(data)
+
+def _build_blobs(data):
+    """Concatenate the lowered names into one contiguous string per index.
+
+    A substring query then becomes repeated str.find over a single
+    string — a C-level scan instead of a Python-level loop testing each
+    name — with bisect over the offsets mapping a hit back to its entry.
+    Names cannot contain the newline separator (input() strips it), so a
+    match can never straddle two names.
+    """
+    for key in ("_student", "_faculty"):
+        index = data[key + "_index"]
+        data[key + "_blob"] = "\n".join(t[0] for t in index)
+        offsets = []
+        pos = 0
+        for t in index:
+            offsets.append(pos)
+            pos += len(t[0]) + 1
+        data[key + "_offsets"] = offsets
+
+def _blob_search(data, key, query):
+    """Yield index positions of entries whose lowered name contains query."""
+    if len(data[key + "_offsets"]) != len(data[key + "_index"]):
+        _build_blobs(data)  # entries were appended since the last build
+    blob = data[key + "_blob"]
+    offsets = data[key + "_offsets"]
+    pos = blob.find(query)
+    while pos != -1:
+        i = bisect.bisect_right(offsets, pos) - 1
+        yield i
+        # Resume from the next name so one entry is reported once even
+        # if the query occurs in it several times.
+        next_start = offsets[i + 1] if i + 1 < len(offsets) else len(blob) + 1
+        pos = blob.find(query, next_start)
+
+def _intern_tree(obj):
+    """Intern every dict key in the loaded tree.
+
+    Keys like "name", "students" and the stream/class names recur across
+    thousands of records; interning lets CPython's dict lookup succeed on
+    pointer equality instead of comparing string contents each time.
+    """
+    if isinstance(obj, dict):
+        return {sys.intern(k): _intern_tree(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_tree(v) for v in obj]
+    return obj
+
+def log_op(entry):
+    """Append one mutation record to the write-ahead log."""
+    global _wal
+    try:
+        if _wal is None:
+            _wal = open(WAL_FILE, "a")
+        _wal.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        _wal.flush()
+    except IOError as e:
+        print(f"⚠️ Error writing log: {e}")
+
+def _replay_wal(data):
+    """Replay mutations logged after the last snapshot was written."""
+    try:
+        with open(WAL_FILE, "r") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    except IOError as e:
+        print(f"⚠️ Error reading log: {e}")
+        return
+
+    for line in lines:
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # torn tail line from a crash mid-append
+        _apply_wal_entry(data, entry)
+
+def _apply_wal_entry(data, entry):
+    streams = data["streams"]
+    op = entry.get("op")
+    if op == "add_stream":
+        streams.setdefault(entry["stream"], {"classes": {}, "faculty": {}, "class_faculty": {}})
+        return
+
+    stream = streams.get(entry.get("stream"))
+    if stream is None:
+        return
+
+    if op == "add_class":
+        stream["classes"].setdefault(entry["cls"], {"students": {}})
+    elif op == "add_student":
+        cls_data = stream["classes"].get(entry["cls"])
+        if cls_data is not None:
+            cls_data["students"][entry["sid"]] = {"name": entry["name"]}
+            data["student_counter"] = max(data["student_counter"], int(entry["sid"][3:]) + 1)
+    elif op == "add_faculty":
+        stream["faculty"][entry["fid"]] = {"name": entry["name"], "assigned_class": None}
+        data["faculty_counter"] = max(data["faculty_counter"], int(entry["fid"][3:]) + 1)
+    elif op == "assign_faculty":
+        if entry["fid"] in stream["faculty"]:
+            stream["faculty"][entry["fid"]]["assigned_class"] = entry["cls"]
+    elif op == "remove_stream":
+        streams.pop(entry["stream"], None)
+    elif op == "remove_class":
+        stream["classes"].pop(entry["cls"], None)
+    elif op == "remove_student":
+        cls_data = stream["classes"].get(entry["cls"])
+        if cls_data is not None:
+            cls_data["students"].pop(entry["sid"], None)
+    elif op == "remove_faculty":
+        stream["faculty"].pop(entry["fid"], None)
+
+def _truncate_wal():
+    """Discard the log; called right after a snapshot covers it."""
+    global _wal
+    if _wal is not None:
+        _wal.close()
+        _wal = None
+    try:
+        open(WAL_FILE, "w").close()
+    except IOError:
+        pass
+
+def save_data(data):
+    try:
+        # Write to a temp file and atomically swap it in so a crash
+        # mid-write can never leave a corrupt erp_data.json behind.
+        # Serialize once and write in a single call instead of letting
+        # json.dump issue a tiny write per token. Compact separators:
+        # only the program reads this file back, so no pretty-printing.
+        # Underscore keys are runtime-only indexes; default=list turns
+        # the index sets into JSON lists and load_data rebuilds them.
+        payload = {k: v for k, v in data.items() if not k.startswith("_")}
+        if orjson is not None:
+            body = orjson.dumps(payload, default=list)
+        else:
+            body = json.dumps(payload, separators=(",", ":"), default=list).encode()
+        tmp_file = DATA_FILE + ".tmp"
+        with gzip.open(tmp_file, "wb", compresslevel=1) as f:
+            f.write(body)
+        os.replace(tmp_file, DATA_FILE)
+        _truncate_wal()
+    except IOError as e:
+        print(f"⚠️ Error saving data: {e}")
+
+def mark_dirty(data):
+    """Record a mutation; autosave once enough have accumulated."""
+    global _dirty_count
+    _dirty_count += 1
+    if _dirty_count >= MAX_DIRTY:
+        save_data(data)
+        _dirty_count = 0
+
+def backup_data(data):
+    backup_file = f"erp_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    try:
+        # Binary mode with a large buffer so the backup goes to disk in
+        # big chunks; orjson's C serializer is used when available.
+        with open(backup_file, "wb", buffering=1 << 20) as f:
+            payload = {k: v for k, v in data.items() if not k.startswith("_")}
+            if orjson is not None:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2, default=list))
+            else:
+                f.write(json.dumps(payload, indent=4, default=list).encode())
+        print(f"✅ Backup created: {backup_file}")
+        return True
+    except IOError as e:
+        print(f"⚠️ Error creating backup: {e}")
+        return False
+
+
+# ------------------ Utility ------------------
+# Validators shared across prompts, hoisted to module level so each call
+# does not allocate a fresh lambda (and list literal) per keystroke.
+_YES_NO = frozenset({"y", "n"})
+
+def _nonempty(value):
+    return bool(value)
+
+def _is_yes_no(value):
+    return value.lower() in _YES_NO
+
+def get_valid_input(prompt, input_type=str, validation_func=None, allow_empty=False):
+    while True:
+        try:
+            value = input(prompt).strip()
+            if allow_empty and not value:
+                return None
+            if not value and not allow_empty:
+                print("⚠️ This field cannot be empty!")
+                continue
+                
+            if input_type != str:
+                value = input_type(value)
+                
+            if validation_func and not validation_func(value):
+                raise ValueError
+            return value
+        except ValueError:
+            print("⚠️ Invalid input! Please try again.")
+
+def select_option(options, title="Choose an option", allow_back=False):
+    """Helper to display numbered menu from a list/dict keys"""
+    if not options:
+        print("⚠️ Nothing available!")
+        return None
+        
+    print(f"\n--- {title} ---")
+    n = len(options)
+
+    for i, opt in enumerate(options, 1):
+        print(f"{i}. {opt}")
+
+    if allow_back:
+        print(f"{n + 1}. Back")
+
+    try:
+        choice = get_valid_input("Enter choice: ", int)
+        if allow_back and choice == n + 1:
+            return None
+
+        if 1 <= choice <= n:
+            # Dicts iterate in insertion order, matching the numbering
+            # above; islice picks the chosen key without copying every
+            # key into a throwaway list.
+            return next(itertools.islice(iter(options), choice - 1, None))
+        else:
+            print("⚠️ Invalid choice!")
+            return None
+    except ValueError:
+        print("⚠️ Enter a number!")
+        return None
+
+
+# ------------------ ERP Operations ------------------
+def add_stream(data):
+    stream_name = get_valid_input("Enter stream name (e.g. BCA, BSc IT): ", validation_func=_nonempty)
+    stream_name = sys.intern(stream_name)
+    if stream_name not in data["streams"]:
+        data["streams"][stream_name] = {"classes": {}, "faculty": {}, "class_faculty": {}, "_unassigned": set()}
+        log_op({"op": "add_stream", "stream": stream_name})
+        mark_dirty(data)
+        print(f"✅ Stream '{stream_name}' added.")
+    else:
+        print("⚠️ Stream already exists!")
+
+def add_class(data):
+    stream = select_option(data["streams"], "Select Stream", allow_back=True)
+    if not stream:
+        return
+        
+    class_name = get_valid_input("Enter class (e.g. 1A, 2B): ", validation_func=_nonempty)
+    class_name = sys.intern(class_name)
+    classes = data["streams"][stream]["classes"]
+    if class_name not in classes:
+        classes[class_name] = {"students": {}}
+        log_op({"op": "add_class", "stream": stream, "cls": class_name})
+        mark_dirty(data)
+        print(f"✅ Class '{class_name}' added in {stream}.")
+    else:
+        print("⚠️ Class already exists!")
+
+def add_student(data):
+    stream = select_option(data["streams"], "Select Stream", allow_back=True)
+    if not stream:
+        return
+        
+    classes = data["streams"][stream]["classes"]
+    if not classes:
+        print("⚠️ No classes available in this stream!")
+        return
+        
+    class_name = select_option(classes, f"Select Class in {stream}", allow_back=True)
+    if not class_name:
+        return
+        
+    student_name = get_valid_input("Enter student name: ", validation_func=_nonempty)
+    counter = data["student_counter"]
+    student_id = f"STU{counter:03d}"
+    data["student_counter"] = counter + 1
+    name_lower = student_name.lower()
+    classes[class_name]["students"][student_id] = {"name": student_name, "_nl": name_lower}
+    data["_student_index"].append((name_lower, student_name, student_id, stream, class_name))
+    log_op({"op": "add_student", "stream": stream, "cls": class_name, "sid": student_id, "name": student_name})
+    mark_dirty(data)
+    print(f"✅ Student '{student_name}' (ID: {student_id}) added to {stream} - {class_name}.")
+
+def add_faculty(data):
+    stream = select_option(data["streams"], "Select Stream", allow_back=True)
+    if not stream:
+        return
+        
+    faculty_name = get_valid_input("Enter faculty name: ", validation_func=_nonempty)
+    counter = data["faculty_counter"]
+    faculty_id = f"FAC{counter:03d}"
+    data["faculty_counter"] = counter + 1
+    name_lower = faculty_name.lower()
+    s_entry = data["streams"][stream]
+    s_entry["faculty"][faculty_id] = {
+        "name": faculty_name,
+        "_nl": name_lower,
+        "assigned_class": None,
+    }
+    data["_faculty_index"].append((name_lower, faculty_name, faculty_id, stream))
+    s_entry["_unassigned"].add(faculty_id)
+    log_op({"op": "add_faculty", "stream": stream, "fid": faculty_id, "name": faculty_name})
+    mark_dirty(data)
+    print(f"✅ Faculty '{faculty_name}' (ID: {faculty_id}) added in {stream}.")
+
+def assign_faculty(data):
+    stream = select_option(data["streams"], "Select Stream", allow_back=True)
+    if not stream:
+        return
+
+    # Bind the stream entry once; the repeated data["streams"][stream]
+    # chains each re-hash both keys.
+    s_entry = data["streams"][stream]
+
+    faculty_list = s_entry["faculty"]
+    if not faculty_list:
+        print("⚠️ No faculty available in this stream!")
+        return
+
+    faculty = select_option(faculty_list, "Select Faculty", allow_back=True)
+    if not faculty:
+        return
+
+    classes = s_entry["classes"]
+    if not classes:
+        print("⚠️ No classes available in this stream!")
+        return
+
+    class_name = select_option(classes, f"Select Class in {stream}", allow_back=True)
+    if not class_name:
+        return
+
+    class_faculty = s_entry["class_faculty"]
+    fac = faculty_list[faculty]
+    if fac["assigned_class"]:
+        class_faculty.get(fac["assigned_class"], set()).discard(faculty)
+    fac["assigned_class"] = class_name
+    class_faculty.setdefault(class_name, set()).add(faculty)
+    s_entry["_unassigned"].discard(faculty)
+    log_op({"op": "assign_faculty", "stream": stream, "fid": faculty, "cls": class_name})
+    mark_dirty(data)
+    print(
+        f"✅ Faculty '{fac['name']}' "
+        f"assigned to {stream} - {class_name}."
+    )
+
+def remove_stream(data):
+    stream = select_option(data["streams"], "Select Stream to Remove", allow_back=True)
+    if not stream:
+        return
+        
+    confirm = get_valid_input(f"Are you sure you want to remove stream '{stream}'? (y/n): ", 
+                             validation_func=_is_yes_no)
+    if confirm.lower() == 'y':
+        del data["streams"][stream]
+        build_search_index(data)
+        log_op({"op": "remove_stream", "stream": stream})
+        mark_dirty(data)
+        print(f"✅ Stream '{stream}' removed.")
+    else:
+        print("❌ Stream removal cancelled.")
+
+def remove_class(data):
+    stream = select_option(data["streams"], "Select Stream", allow_back=True)
+    if not stream:
+        return
+        
+    s_entry = data["streams"][stream]
+    classes = s_entry["classes"]
+    if not classes:
+        print("⚠️ No classes available in this stream!")
+        return
+
+    class_name = select_option(classes, f"Select Class to Remove from {stream}", allow_back=True)
+    if not class_name:
+        return
+
+    # Check if any faculty is assigned to this class
+    if s_entry["class_faculty"].get(class_name):
+        print("⚠️ Cannot remove class - faculty members are assigned to it!")
+        return
+
+    confirm = get_valid_input(f"Are you sure you want to remove class '{class_name}'? (y/n): ",
+                             validation_func=_is_yes_no)
+    if confirm.lower() == 'y':
+        del classes[class_name]
+        s_entry["class_faculty"].pop(class_name, None)
+        build_search_index(data)
+        log_op({"op": "remove_class", "stream": stream, "cls": class_name})
+        mark_dirty(data)
+        print(f"✅ Class '{class_name}' removed from {stream}.")
+    else:
+        print("❌ Class removal cancelled.")
+
+def remove_student(data):
+    stream = select_option(data["streams"], "Select Stream", allow_back=True)
+    if not stream:
+        return
+        
+    classes = data["streams"][stream]["classes"]
+    if not classes:
+        print("⚠️ No classes available in this stream!")
+        return
+        
+    class_name = select_option(classes, f"Select Class in {stream}", allow_back=True)
+    if not class_name:
+        return
+        
+    students = classes[class_name]["students"]
+    if not students:
+        print("⚠️ No students in this class!")
+        return
+        
+    student_id = select_option(students, "Select Student to Remove", allow_back=True)
+    if not student_id:
+        return
+        
+    confirm = get_valid_input(f"Are you sure you want to remove student '{students[student_id]['name']}'? (y/n): ", 
+                             validation_func=_is_yes_no)
+    if confirm.lower() == 'y':
+        del students[student_id]
+        build_search_index(data)
+        log_op({"op": "remove_student", "stream": stream, "cls": class_name, "sid": student_id})
+        mark_dirty(data)
+        print(f"✅ Student removed from {stream} - {class_name}.")
+    else:
+        print("❌ Student removal cancelled.")
+
+def remove_faculty(data):
+    stream = select_option(data["streams"], "Select Stream", allow_back=True)
+    if not stream:
+        return
+        
+    s_entry = data["streams"][stream]
+    faculty_list = s_entry["faculty"]
+    if not faculty_list:
+        print("⚠️ No faculty available in this stream!")
+        return
+
+    faculty_id = select_option(faculty_list, "Select Faculty to Remove", allow_back=True)
+    if not faculty_id:
+        return
+
+    confirm = get_valid_input(f"Are you sure you want to remove faculty '{faculty_list[faculty_id]['name']}'? (y/n): ",
+                             validation_func=_is_yes_no)
+    if confirm.lower() == 'y':
+        assigned = faculty_list[faculty_id]["assigned_class"]
+        if assigned:
+            s_entry["class_faculty"].get(assigned, set()).discard(faculty_id)
+        del faculty_list[faculty_id]
+        s_entry["_unassigned"].discard(faculty_id)
+        build_search_index(data)
+        log_op({"op": "remove_faculty", "stream": stream, "fid": faculty_id})
+        mark_dirty(data)
+        print(f"✅ Faculty removed from {stream}.")
+    else:
+        print("❌ Faculty removal cancelled.")
+
+def search_student(data):
+    name = get_valid_input("Enter student name to search: ", allow_empty=True)
+    if not name:
+        return
+        
+    name = name.lower()
+    found = False
+
+    for i in _blob_search(data, "_student", name):
+        _, display, sid, stream, cls = data["_student_index"][i]
+        print(f"Found: {display} (ID: {sid}) in {stream} - {cls}")
+        found = True
+
+    if not found:
+        print("No students found with that name.")
+
+def search_faculty(data):
+    name = get_valid_input("Enter faculty name to search: ", allow_empty=True)
+    if not name:
+        return
+        
+    name = name.lower()
+    found = False
+
+    for i in _blob_search(data, "_faculty", name):
+        _, display, fid, stream = data["_faculty_index"][i]
+        assigned = data["streams"][stream]["faculty"][fid]["assigned_class"]
+        print(f"Found: {display} (ID: {fid}) in {stream} - Assigned to: {assigned}")
+        found = True
+
+    if not found:
+        print("No faculty found with that name.")
+
+def view_data(data):
+    if not data["streams"]:
+        print("No data available. Add streams, classes, students, and faculty first.")
+        return
+        
+    # Accumulate everything and write once: one big write instead of a
+    # print (and flush) per student, class, and faculty line.
+    out = []
+    for stream, details in data["streams"].items():
+        out.append(f"\n📘 Stream: {stream}\n")
+
+        # Show classes and students
+        out.append("   Classes & Students:\n")
+        if details["classes"]:
+            for cls, cls_data in details["classes"].items():
+                out.append(f"     • {cls}:\n")
+                students = cls_data["students"]
+                if students:
+                    out.extend(f"         - {sid}: {sdata['name']}\n" for sid, sdata in students.items())
+                else:
+                    out.append("         (No students yet)\n")
+        else:
+            out.append("     (No classes yet)\n")
+
+        # Show faculty
+        out.append("   Faculty:\n")
+        if details["faculty"]:
+            out.extend(
+                f"     • {fid}: {fac_data['name']} "
+                f"(Assigned Class: {fac_data['assigned_class'] or 'None'})\n"
+                for fid, fac_data in details["faculty"].items()
+            )
+        else:
+            out.append("     (No faculty yet)\n")
+
+    sys.stdout.write("".join(out))
+
+def view_faculty_without_assignments(data):
+    # The per-stream _unassigned sets make this proportional to the
+    # number of unassigned faculty, not the size of the database.
+    out = []
+    for stream, details in data["streams"].items():
+        faculty = details["faculty"]
+        out.extend(
+            f"{fid}: {faculty[fid]['name']} in {stream} (No assignment)\n"
+            for fid in details["_unassigned"]
+        )
+
+    if out:
+        sys.stdout.write("".join(out))
+    else:
+        print("All faculty members have assignments.")
+
+def view_classes_without_faculty(data):
+    out = []
+    for stream, details in data["streams"].items():
+        class_faculty = details["class_faculty"]
+        out.extend(
+            f"{stream} - {cls}: No faculty assigned\n"
+            for cls in details["classes"]
+            if not class_faculty.get(cls)
+        )
+
+    if out:
+        sys.stdout.write("".join(out))
+    else:
+        print("All classes have faculty assignments.")
+
+
+# ------------------ Menu ------------------
+# Built once; the loop emits it with a single write instead of one
+# print call per line.
+MENU = """
+--- Educational ERP ---
+1. Add Stream
+2. Add Class
+3. Add Student
+4. Add Faculty
+5. Assign Faculty to Class
+6. View All Data
+7. Remove Stream
+8. Remove Class
+9. Remove Student
+10. Remove Faculty
+11. Search Student
+12. Search Faculty
+13. View Unassigned Faculty
+14. View Classes Without Faculty
+15. Create Backup
+16. Exit
+"""
+
+# Jump table for the menu: one dict lookup per choice instead of a
+# 16-way if/elif chain. Exit (16) is handled separately in the loop.
+ACTIONS = {
+    1: add_stream,
+    2: add_class,
+    3: add_student,
+    4: add_faculty,
+    5: assign_faculty,
+    6: view_data,
+    7: remove_stream,
+    8: remove_class,
+    9: remove_student,
+    10: remove_faculty,
+    11: search_student,
+    12: search_faculty,
+    13: view_faculty_without_assignments,
+    14: view_classes_without_faculty,
+    15: backup_data,
+}
+
+def main():
+    data = load_data()
+    atexit.register(save_data, data)
+
+    while True:
+        sys.stdout.write(MENU)
+
+        choice = get_valid_input("Enter choice: ", int)
+
+        action = ACTIONS.get(choice)
+        if action:
+            action(data)
+        elif choice == 16:
+            save_data(data)
+            print("💾 Data saved. Exiting...")
+            break
+        else:
+            print("⚠️ Invalid choice!")
+
+
+if __name__ == "__main__":
+    main()